@@ -3,7 +3,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from apriori_algorithm import AprioriAlgorithm
+from apriori_algorithm import AprioriAlgorithm, StreamingApriori
 import io
 
 st.set_page_config(
@@ -175,6 +175,15 @@ with st.sidebar:
         help="Minimum confidence untuk association rules"
     )
     
+    window_days = st.number_input(
+        "Jendela Waktu (hari)",
+        min_value=1,
+        max_value=365,
+        value=7,
+        step=1,
+        help="Hanya transaksi N hari terakhir yang dianalisis (jika CSV memiliki kolom Timestamp)"
+    )
+    
     st.markdown("---")
     
     # Info
@@ -244,6 +253,53 @@ if uploaded_file is not None:
                         </div>
                     """, unsafe_allow_html=True)
             
+            # Constraints
+            with st.sidebar:
+                st.markdown("---")
+                st.markdown("### <i class='fas fa-filter'></i> Batasan Analisis", unsafe_allow_html=True)
+                
+                item_options = sorted(all_items)
+                
+                max_length = st.number_input(
+                    "Maksimum Ukuran Itemset",
+                    min_value=0,
+                    max_value=10,
+                    value=0,
+                    step=1,
+                    help="Jumlah item maksimum per itemset (0 = tanpa batas)"
+                )
+                required_items = st.multiselect(
+                    "Harus Memuat Item",
+                    item_options,
+                    help="Itemset harus memuat minimal satu item ini"
+                )
+                excluded_items = st.multiselect(
+                    "Kecualikan Item",
+                    item_options,
+                    help="Item yang tidak boleh muncul dalam itemset"
+                )
+                antecedent_items = st.multiselect(
+                    "Item Antecedent (Jika)",
+                    item_options,
+                    help="Antecedent hanya boleh berisi item ini (kosong = semua). "
+                         "Frequent itemsets harus memuat minimal satu item ini; jika Item Consequent "
+                         "juga diisi, hanya item dari kedua daftar"
+                )
+                consequent_items = st.multiselect(
+                    "Item Consequent (Maka)",
+                    item_options,
+                    help="Consequent hanya boleh berisi item ini (kosong = semua). "
+                         "Frequent itemsets harus memuat minimal satu item ini"
+                )
+            
+            constraints = dict(
+                max_length=max_length or None,
+                required_items=required_items,
+                excluded_items=excluded_items,
+                antecedent_items=antecedent_items,
+                consequent_items=consequent_items
+            )
+            
             # Run analysis button
             st.markdown("<br>", unsafe_allow_html=True)
             
@@ -256,11 +312,30 @@ if uploaded_file is not None:
                         transactions.append(transaction)
                     
                     # Run Apriori
-                    apriori = AprioriAlgorithm(
-                        min_support=min_support/100,
-                        min_confidence=min_confidence/100
-                    )
-                    apriori.load_transactions(transactions)
+                    if 'Timestamp' in df.columns:
+                        # Sliding window over the last N days
+                        apriori = StreamingApriori(
+                            min_support=min_support/100,
+                            min_confidence=min_confidence/100,
+                            window=pd.Timedelta(days=window_days),
+                            max_transactions=None,
+                            **constraints
+                        )
+                        timestamps = pd.to_datetime(df['Timestamp'], errors='coerce').reset_index(drop=True)
+                        valid_timestamps = timestamps.dropna().sort_values(kind='stable')
+                        if len(valid_timestamps) < len(timestamps):
+                            st.warning(f"{len(timestamps) - len(valid_timestamps)} transaksi tanpa Timestamp yang valid diabaikan")
+                        apriori.consume(
+                            ((timestamp, transactions[i]) for i, timestamp in valid_timestamps.items()),
+                            timestamped=True
+                        )
+                    else:
+                        apriori = AprioriAlgorithm(
+                            min_support=min_support/100,
+                            min_confidence=min_confidence/100,
+                            **constraints
+                        )
+                        apriori.load_transactions(transactions)
                     apriori.find_frequent_itemsets()
                     apriori.generate_association_rules()
                     
@@ -269,6 +344,8 @@ if uploaded_file is not None:
                     st.session_state['analysis_done'] = True
                     
                     st.success("Analisis selesai!")
+                    if isinstance(apriori, StreamingApriori):
+                        st.info(f"{len(apriori.transactions)} transaksi dalam jendela {window_days} hari terakhir")
             
             # Display results if analysis is done
             if 'analysis_done' in st.session_state and st.session_state['analysis_done']:
@@ -287,6 +364,9 @@ if uploaded_file is not None:
                     st.markdown("### <i class='fas fa-chart-bar'></i> Frequent Itemsets", unsafe_allow_html=True)
                     st.markdown("Kumpulan item yang sering muncul bersamaan dalam transaksi")
                     
+                    if apriori.antecedent_items or apriori.consequent_items:
+                        st.info("Frequent itemsets ikut dibatasi oleh Item Antecedent/Consequent di sidebar")
+                    
                     freq_df = apriori.get_frequent_itemsets_df()
                     
                     if not freq_df.empty:
@@ -366,20 +446,15 @@ if uploaded_file is not None:
                     # Visualization 1: Top Frequent Items
                     st.markdown("#### <i class='fas fa-trophy'></i> Top 10 Item Paling Sering Dibeli", unsafe_allow_html=True)
                     
-                    item_counts = {}
-                    for transaction in transactions:
-                        for item in transaction:
-                            item_counts[item] = item_counts.get(item, 0) + 1
-                    
-                    top_items = sorted(item_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+                    top_items = apriori.get_item_counts().nlargest(10)
                     
-                    if top_items:
+                    if not top_items.empty:
                         fig = px.bar(
-                            x=[item[1] for item in top_items],
-                            y=[item[0] for item in top_items],
+                            x=top_items.values,
+                            y=top_items.index,
                             orientation='h',
                             labels={'x': 'Jumlah Transaksi', 'y': 'Produk'},
-                            color=[item[1] for item in top_items],
+                            color=top_items.values,
                             color_continuous_scale='Viridis'
                         )
                         fig.update_layout(
@@ -478,6 +553,7 @@ else:
                     <li><strong>TransactionID</strong>: ID unik transaksi</li>
                     <li><strong>Items</strong>: Daftar produk (dipisah koma)</li>
                 </ol>
+                <p>Opsional: kolom <strong>Timestamp</strong> untuk analisis jendela waktu N hari terakhir</p>
                 <p><strong>Contoh:</strong></p>
                 <code>
                 TransactionID,Items<br>
@@ -3,13 +3,18 @@ Implementasi Algoritma Apriori untuk Market Basket Analysis
 Author: Data Mining Project
 """
 
+from bisect import bisect_right
 from itertools import combinations
-from collections import defaultdict
+from collections import defaultdict, deque
+import numpy as np
 import pandas as pd
+from scipy import sparse
 
 
 class AprioriAlgorithm:
-    def __init__(self, min_support=0.2, min_confidence=0.5):
+    def __init__(self, min_support=0.2, min_confidence=0.5, max_length=None,
+                 required_items=None, excluded_items=None,
+                 antecedent_items=None, consequent_items=None):
         """
         Initialize Apriori Algorithm
         
@@ -19,12 +24,33 @@ class AprioriAlgorithm:
             Minimum support threshold (0-1)
         min_confidence : float
             Minimum confidence threshold (0-1)
+        max_length : int or None
+            Maximum itemset size, None for no limit
+        required_items : iterable or None
+            Itemsets must contain at least one of these items
+        excluded_items : iterable or None
+            Items that must never appear in an itemset
+        antecedent_items : iterable or None
+            Rule antecedents may only contain these items. Itemsets must
+            contain at least one of them, and together with consequent_items
+            only items of both lists
+        consequent_items : iterable or None
+            Rule consequents may only contain these items. Itemsets must
+            contain at least one of them
         """
         self.min_support = min_support
         self.min_confidence = min_confidence
+        self.max_length = max_length
+        self.required_items = frozenset(required_items or ())
+        self.excluded_items = frozenset(excluded_items or ())
+        self.antecedent_items = frozenset(antecedent_items or ())
+        self.consequent_items = frozenset(consequent_items or ())
         self.transactions = []
         self.frequent_itemsets = {}
         self.association_rules = []
+        self.incidence_items = []
+        self._item_index = {}
+        self._incidence = None
         
     def load_transactions(self, transactions_list):
         """
@@ -36,6 +62,87 @@ class AprioriAlgorithm:
             Each transaction is a list of items
         """
         self.transactions = [set(transaction) for transaction in transactions_list]
+        self._incidence = None
+        
+    def load_onehot(self, onehot_df):
+        """
+        Load transactions from a one-hot encoded DataFrame
+        
+        Parameters:
+        -----------
+        onehot_df : pandas.DataFrame
+            One row per transaction, one boolean/0-1 column per item.
+            Sparse columns are converted without densifying
+        """
+        if len(onehot_df.columns) and all(isinstance(dtype, pd.SparseDtype) for dtype in onehot_df.dtypes):
+            matrix = onehot_df.sparse.to_coo()
+        else:
+            matrix = sparse.csc_matrix(onehot_df.fillna(False).to_numpy(dtype=bool))
+        self.load_sparse_matrix(matrix, onehot_df.columns)
+    
+    def load_sparse_matrix(self, matrix, items):
+        """
+        Load transactions from a sparse transaction x item matrix
+        
+        Supports are counted on the matrix directly, self.transactions is
+        only filled by load_transactions() and stays empty here.
+        
+        Parameters:
+        -----------
+        matrix : scipy.sparse matrix
+            One row per transaction, nonzero where the item was bought
+        items : list
+            Unique item label of each column
+        """
+        items = self._check_item_labels(matrix, items)
+        
+        self.transactions = []
+        self._set_incidence_matrix(matrix, items)
+    
+    def _check_item_labels(self, matrix, items):
+        items = list(items)
+        if matrix.shape[1] != len(items):
+            raise ValueError(f"matrix has {matrix.shape[1]} columns but {len(items)} item labels were given")
+        if len(set(items)) != len(items):
+            raise ValueError("item labels must be unique")
+        return items
+    
+    def load_long_format(self, long_df, transaction_col='TransactionID', item_col='Item'):
+        """
+        Load transactions from a long-format DataFrame
+        
+        Parameters:
+        -----------
+        long_df : pandas.DataFrame
+            One row per (transaction, item) pair
+        transaction_col : str
+            Column with the transaction ID
+        item_col : str
+            Column with the item
+        """
+        transaction_codes, transaction_ids = pd.factorize(long_df[transaction_col])
+        item_codes, items = pd.factorize(long_df[item_col])
+        
+        # Rows with a missing item still count as a transaction
+        mask = (transaction_codes >= 0) & (item_codes >= 0)
+        matrix = sparse.coo_matrix(
+            (np.ones(mask.sum(), dtype=np.int32), (transaction_codes[mask], item_codes[mask])),
+            shape=(len(transaction_ids), len(items))
+        )
+        self.load_sparse_matrix(matrix, items)
+        
+    def _set_incidence_matrix(self, matrix, items):
+        # Binary CSC: column slices are cheap and duplicates count once
+        matrix = sparse.csc_matrix(matrix, copy=True)
+        matrix.sum_duplicates()
+        matrix.eliminate_zeros()
+        
+        self._incidence = sparse.csc_matrix(
+            (np.ones(matrix.nnz, dtype=np.int32), matrix.indices, matrix.indptr),
+            shape=matrix.shape
+        )
+        self.incidence_items = list(items)
+        self._item_index = {item: i for i, item in enumerate(self.incidence_items)}
         
     def calculate_support(self, itemset):
         """
@@ -50,8 +157,13 @@ class AprioriAlgorithm:
         --------
         float : support value
         """
-        count = sum(1 for transaction in self.transactions if itemset.issubset(transaction))
-        return count / len(self.transactions)
+        matrix = self.get_incidence_matrix()
+        if matrix.shape[0] == 0 or any(item not in self._item_index for item in itemset):
+            return 0.0
+        
+        columns = [self._item_index[item] for item in itemset]
+        count = int((matrix[:, columns].sum(axis=1) == len(columns)).sum())
+        return count / matrix.shape[0]
     
     def get_items(self):
         """
@@ -61,11 +173,100 @@ class AprioriAlgorithm:
         --------
         set : all unique items
         """
+        if self._incidence is not None:
+            counts = self.get_item_counts()
+            return set(counts.index[counts > 0])
+        
         items = set()
         for transaction in self.transactions:
             items.update(transaction)
         return items
     
+    def get_incidence_matrix(self):
+        """
+        Get the sparse transaction x item incidence matrix
+        
+        The matrix is built once and cached until the transactions change.
+        Column j belongs to self.incidence_items[j].
+        
+        Returns:
+        --------
+        scipy.sparse.csc_matrix : 1 where the transaction contains the item
+        """
+        if self._incidence is None:
+            # Columns in first-seen order, items need not be comparable
+            index = {}
+            indptr = [0]
+            indices = []
+            for transaction in self.transactions:
+                indices.extend(index.setdefault(item, len(index)) for item in transaction)
+                indptr.append(len(indices))
+            
+            data = np.ones(len(indices), dtype=np.int32)
+            matrix = sparse.csr_matrix(
+                (data, indices, indptr),
+                shape=(len(indptr) - 1, len(index))
+            )
+            self._set_incidence_matrix(matrix, list(index))
+        return self._incidence
+    
+    def get_item_counts(self):
+        """
+        Count the transactions containing each item
+        
+        Returns:
+        --------
+        pandas.Series : {item: count}
+        """
+        matrix = self.get_incidence_matrix()
+        counts = np.asarray(matrix.sum(axis=0)).ravel()
+        return pd.Series(counts, index=self.incidence_items, dtype=int)
+    
+    def find_frequent_pairs(self, frequent_1, required=frozenset()):
+        """
+        Find frequent 2-itemsets with one sparse matrix product
+        
+        Parameters:
+        -----------
+        frequent_1 : list of frozensets
+            Frequent 1-itemsets
+        required : frozenset
+            Pairs must contain at least one of these items (empty = any)
+            
+        Returns:
+        --------
+        list : [(itemset, support), ...]
+        """
+        matrix = self.get_incidence_matrix()
+        items = [next(iter(itemset)) for itemset in frequent_1]
+        
+        frequent_matrix = matrix[:, [self._item_index[item] for item in items]]
+        if required:
+            required_columns = np.array([i for i, item in enumerate(items) if item in required], dtype=int)
+            required_matrix = frequent_matrix[:, required_columns]
+        else:
+            required_columns = np.arange(len(items))
+            required_matrix = frequent_matrix
+        is_required = np.zeros(len(items), dtype=bool)
+        is_required[required_columns] = True
+        
+        # Co-occurrence counts of every frequent item with every required one
+        co_occurrence = (frequent_matrix.T @ required_matrix).tocoo()
+        rows = co_occurrence.row
+        cols = required_columns[co_occurrence.col]
+        support = co_occurrence.data / matrix.shape[0]
+        
+        # A pair of two required items is counted in both orders, keep one
+        mask = (rows != cols) & ((rows < cols) | ~is_required[rows]) & (support >= self.min_support)
+        first = np.minimum(rows, cols)[mask]
+        second = np.maximum(rows, cols)[mask]
+        support = support[mask]
+        
+        # Same order as generate_candidates
+        order = np.lexsort((second, first))
+        
+        return [(frozenset([items[first[i]], items[second[i]]]), float(support[i])) for i in order]
+    
     def generate_candidates(self, itemsets, k):
         """
         Generate candidate itemsets of size k
@@ -106,8 +307,19 @@ class AprioriAlgorithm:
         --------
         dict : {itemset_size: [(itemset, support), ...]}
         """
-        # Get all unique items
-        items = self.get_items()
+        # Get all unique items, excluded items never enter the lattice
+        items = self.get_items() - self.excluded_items
+        if self.antecedent_items and self.consequent_items:
+            items &= self.antecedent_items | self.consequent_items
+        
+        # Every rule itemset needs a required, an antecedent and a consequent item
+        required_groups = [group for group in (self.required_items, self.antecedent_items,
+                                               self.consequent_items) if group]
+        
+        # Counting is limited by the smallest group alone: an itemset with one
+        # of its items is always joined from two size k-1 itemsets that also
+        # have it, which no longer holds when several groups must all match
+        required = min(required_groups, key=len) if required_groups else frozenset()
         
         # Find frequent 1-itemsets
         frequent_1 = []
@@ -117,34 +329,74 @@ class AprioriAlgorithm:
             if support >= self.min_support:
                 frequent_1.append(itemset)
         
+        # All frequent items are still needed to build larger itemsets
         self.frequent_itemsets[1] = [(itemset, self.calculate_support(itemset)) 
-                                      for itemset in frequent_1]
+                                      for itemset in frequent_1
+                                      if all(itemset & group for group in required_groups)]
         
         # Find frequent k-itemsets
         k = 2
         current_frequent = frequent_1
         
-        while current_frequent:
-            # Generate candidates
-            candidates = self.generate_candidates(current_frequent, k)
-            
-            # Filter by minimum support
-            frequent_k = []
-            for candidate in candidates:
-                support = self.calculate_support(candidate)
-                if support >= self.min_support:
-                    frequent_k.append(candidate)
+        while current_frequent and (self.max_length is None or k <= self.max_length):
+            if k == 2:
+                # All pairs are counted at once, without a scan per candidate
+                frequent_k = self.find_frequent_pairs(current_frequent, required)
+            else:
+                # Generate candidates
+                candidates = self.generate_candidates(current_frequent, k)
+                
+                # Only candidates with a required item are counted; they are
+                # always joined from size k-1 itemsets that have one
+                if required:
+                    candidates = [candidate for candidate in candidates if candidate & required]
+                
+                # Filter by minimum support
+                frequent_k = []
+                for candidate in candidates:
+                    support = self.calculate_support(candidate)
+                    if support >= self.min_support:
+                        frequent_k.append((candidate, support))
             
             if frequent_k:
-                self.frequent_itemsets[k] = [(itemset, self.calculate_support(itemset)) 
-                                              for itemset in frequent_k]
-                current_frequent = frequent_k
+                reported = [(itemset, support) for itemset, support in frequent_k
+                            if all(itemset & group for group in required_groups)]
+                if reported:
+                    self.frequent_itemsets[k] = reported
+                current_frequent = [itemset for itemset, support in frequent_k]
                 k += 1
             else:
                 break
         
         return self.frequent_itemsets
     
+    def generate_rule_splits(self, itemset):
+        """
+        Generate (antecedent, consequent) splits allowed by the constraints
+        
+        Parameters:
+        -----------
+        itemset : frozenset
+            Frequent itemset to split
+            
+        Returns:
+        --------
+        generator of (frozenset, frozenset)
+        """
+        # Items not allowed on one side are forced to the other side
+        fixed_antecedent = itemset - self.consequent_items if self.consequent_items else frozenset()
+        fixed_consequent = itemset - self.antecedent_items if self.antecedent_items else frozenset()
+        if fixed_antecedent & fixed_consequent:
+            return
+        
+        free = list(itemset - fixed_antecedent - fixed_consequent)
+        for i in range(len(free) + 1):
+            for extra in combinations(free, i):
+                antecedent = fixed_antecedent | frozenset(extra)
+                consequent = itemset - antecedent
+                if antecedent and consequent:
+                    yield antecedent, consequent
+    
     def generate_association_rules(self):
         """
         Generate association rules from frequent itemsets
@@ -161,32 +413,25 @@ class AprioriAlgorithm:
                 continue
                 
             for itemset, support in self.frequent_itemsets[size]:
-                # Generate all possible rules
-                items = list(itemset)
-                
-                # Try all possible splits
-                for i in range(1, len(items)):
-                    for antecedent in combinations(items, i):
-                        antecedent = frozenset(antecedent)
-                        consequent = itemset - antecedent
+                # Try all allowed splits
+                for antecedent, consequent in self.generate_rule_splits(itemset):
+                    # Calculate confidence
+                    antecedent_support = self.calculate_support(antecedent)
+                    if antecedent_support > 0:
+                        confidence = support / antecedent_support
                         
-                        # Calculate confidence
-                        antecedent_support = self.calculate_support(antecedent)
-                        if antecedent_support > 0:
-                            confidence = support / antecedent_support
+                        if confidence >= self.min_confidence:
+                            # Calculate lift
+                            consequent_support = self.calculate_support(consequent)
+                            lift = confidence / consequent_support if consequent_support > 0 else 0
                             
-                            if confidence >= self.min_confidence:
-                                # Calculate lift
-                                consequent_support = self.calculate_support(consequent)
-                                lift = confidence / consequent_support if consequent_support > 0 else 0
-                                
-                                self.association_rules.append({
-                                    'antecedent': set(antecedent),
-                                    'consequent': set(consequent),
-                                    'support': support,
-                                    'confidence': confidence,
-                                    'lift': lift
-                                })
+                            self.association_rules.append({
+                                'antecedent': set(antecedent),
+                                'consequent': set(consequent),
+                                'support': support,
+                                'confidence': confidence,
+                                'lift': lift
+                            })
         
         # Sort by confidence
         self.association_rules.sort(key=lambda x: x['confidence'], reverse=True)
@@ -205,7 +450,7 @@ class AprioriAlgorithm:
         for size, itemsets in sorted(self.frequent_itemsets.items()):
             for itemset, support in itemsets:
                 data.append({
-                    'Itemset': ', '.join(sorted(itemset)),
+                    'Itemset': ', '.join(sorted(map(str, itemset))),
                     'Size': size,
                     'Support': support,
                     'Support (%)': f"{support * 100:.2f}%"
@@ -224,11 +469,285 @@ class AprioriAlgorithm:
         data = []
         for rule in self.association_rules:
             data.append({
-                'Antecedent (Jika)': ', '.join(sorted(rule['antecedent'])),
-                'Consequent (Maka)': ', '.join(sorted(rule['consequent'])),
+                'Antecedent (Jika)': ', '.join(sorted(map(str, rule['antecedent']))),
+                'Consequent (Maka)': ', '.join(sorted(map(str, rule['consequent']))),
                 'Support': f"{rule['support'] * 100:.2f}%",
                 'Confidence': f"{rule['confidence'] * 100:.2f}%",
                 'Lift': f"{rule['lift']:.2f}"
             })
         
         return pd.DataFrame(data)
+
+
+class StreamingApriori(AprioriAlgorithm):
+    def __init__(self, min_support=0.2, min_confidence=0.5, window=None, max_transactions=100000,
+                 **constraints):
+        """
+        Initialize streaming Apriori over a sliding window of transactions
+        
+        Item and pair counts are updated incrementally as transactions enter
+        and leave the window. Itemsets of size 3 or more are counted on the
+        window's incidence matrix, which is rebuilt in Python from every
+        transaction in the window on the first such query after the window
+        changes (roughly a second for 20,000 transactions).
+        
+        Parameters:
+        -----------
+        min_support : float
+            Minimum support threshold (0-1)
+        min_confidence : float
+            Minimum confidence threshold (0-1)
+        window : str, pandas.Timedelta or None
+            Width of the time window (e.g. '7D'). None keeps no time limit
+        max_transactions : int or None
+            Maximum number of transactions kept in the window, the oldest
+            are dropped first (memory bound). None keeps no limit
+        **constraints
+            Itemset and rule constraints, see AprioriAlgorithm
+        """
+        super().__init__(min_support, min_confidence, **constraints)
+        self.window = pd.Timedelta(window) if window is not None else None
+        self.max_transactions = max_transactions
+        self.transactions = deque()
+        self.timestamps = deque()
+        self.item_counts = defaultdict(int)
+        self.pair_counts = defaultdict(int)
+        self.latest_timestamp = None
+    
+    def load_transactions(self, transactions_list, timestamped=False):
+        """
+        Replace the window with the given transactions
+        
+        Parameters:
+        -----------
+        transactions_list : iterable
+            Item lists, or (timestamp, items) pairs if timestamped
+        timestamped : bool
+            Whether the elements are (timestamp, items) pairs
+        """
+        self.transactions.clear()
+        self._incidence = None
+        self.timestamps.clear()
+        self.item_counts.clear()
+        self.pair_counts.clear()
+        self.latest_timestamp = None
+        self.consume(transactions_list, timestamped)
+    
+    def add_transaction(self, items, timestamp=None):
+        """
+        Add one transaction to the window and expire old ones
+        
+        Late transactions are inserted in timestamp order, or dropped if
+        they are already outside the window.
+        
+        Parameters:
+        -----------
+        items : iterable
+            Items of the transaction
+        timestamp : datetime-like or None
+            Transaction time, required when a time window is set
+        """
+        transaction = frozenset(items)
+        if timestamp is not None:
+            timestamp = pd.Timestamp(timestamp)
+        
+        if self.window is not None:
+            if timestamp is None:
+                raise ValueError("timestamp is required when a time window is set")
+            if pd.isna(timestamp):
+                raise ValueError("timestamp must not be NaT")
+            
+            if self.latest_timestamp is None or timestamp > self.latest_timestamp:
+                self.latest_timestamp = timestamp
+            if timestamp <= self.latest_timestamp - self.window:
+                return
+            
+            # Keep the window ordered by time so expiry only pops from the left
+            position = bisect_right(self.timestamps, timestamp)
+        else:
+            position = len(self.transactions)
+        
+        self.transactions.insert(position, transaction)
+        self.timestamps.insert(position, timestamp)
+        self._update_counts(transaction, 1)
+        
+        self.expire()
+    
+    def consume(self, stream, timestamped=False):
+        """
+        Add transactions from a generator or iterator
+        
+        Parameters:
+        -----------
+        stream : iterable
+            Item lists, or (timestamp, items) pairs if timestamped
+        timestamped : bool
+            Whether the elements are (timestamp, items) pairs
+        """
+        if timestamped:
+            for timestamp, items in stream:
+                self.add_transaction(items, timestamp)
+        else:
+            for items in stream:
+                self.add_transaction(items)
+    
+    def expire(self, now=None):
+        """
+        Remove transactions that fall outside the window
+        
+        Parameters:
+        -----------
+        now : datetime-like or None
+            Current time, defaults to the latest timestamp seen
+        """
+        if self.window is not None:
+            now = pd.Timestamp(now) if now is not None else self.latest_timestamp
+            if now is not None:
+                cutoff = now - self.window
+                while self.timestamps and self.timestamps[0] <= cutoff:
+                    self._pop_oldest()
+        
+        if self.max_transactions is not None:
+            while len(self.transactions) > self.max_transactions:
+                self._pop_oldest()
+    
+    def load_sparse_matrix(self, matrix, items):
+        """
+        Replace the window with the rows of a sparse transaction x item matrix
+        
+        Also used by load_onehot() and load_long_format(). The rows carry no
+        timestamps, so this only works without a time window.
+        
+        Parameters:
+        -----------
+        matrix : scipy.sparse matrix
+            One row per transaction, nonzero where the item was bought
+        items : list
+            Unique item label of each column
+        """
+        if self.window is not None:
+            raise ValueError("a time window needs timestamps, use consume(stream, timestamped=True)")
+        items = self._check_item_labels(matrix, items)
+        
+        matrix = sparse.csr_matrix(matrix, copy=True)
+        matrix.sum_duplicates()
+        matrix.eliminate_zeros()
+        self.load_transactions(
+            [items[j] for j in matrix.indices[start:end]]
+            for start, end in zip(matrix.indptr[:-1], matrix.indptr[1:])
+        )
+    
+    def _pop_oldest(self):
+        transaction = self.transactions.popleft()
+        self.timestamps.popleft()
+        self._update_counts(transaction, -1)
+    
+    def _update_counts(self, transaction, delta):
+        self._incidence = None
+        for item in transaction:
+            self.item_counts[item] += delta
+            if self.item_counts[item] == 0:
+                del self.item_counts[item]
+        for pair in combinations(transaction, 2):
+            pair = frozenset(pair)
+            self.pair_counts[pair] += delta
+            if self.pair_counts[pair] == 0:
+                del self.pair_counts[pair]
+    
+    def calculate_support(self, itemset):
+        """
+        Calculate support for an itemset in the current window
+        
+        Parameters:
+        -----------
+        itemset : set
+            Set of items
+            
+        Returns:
+        --------
+        float : support value
+        """
+        if not self.transactions:
+            return 0.0
+        
+        if len(itemset) == 1:
+            count = self.item_counts.get(next(iter(itemset)), 0)
+        elif len(itemset) == 2:
+            count = self.pair_counts.get(frozenset(itemset), 0)
+        else:
+            return super().calculate_support(itemset)
+        return count / len(self.transactions)
+    
+    def get_item_counts(self):
+        """
+        Count the transactions containing each item in the current window
+        
+        Returns:
+        --------
+        pandas.Series : {item: count}
+        """
+        return pd.Series(dict(self.item_counts), dtype=int)
+    
+    def find_frequent_pairs(self, frequent_1, required=frozenset()):
+        """
+        Find frequent 2-itemsets from the maintained pair counts
+        
+        Parameters:
+        -----------
+        frequent_1 : list of frozensets
+            Frequent 1-itemsets
+        required : frozenset
+            Pairs must contain at least one of these items (empty = any)
+            
+        Returns:
+        --------
+        list : [(itemset, support), ...]
+        """
+        items = [next(iter(itemset)) for itemset in frequent_1]
+        
+        frequent_pairs = []
+        for i in range(len(items)):
+            for j in range(i + 1, len(items)):
+                itemset = frozenset([items[i], items[j]])
+                if required and not itemset & required:
+                    continue
+                support = self.pair_counts.get(itemset, 0) / len(self.transactions)
+                if support >= self.min_support:
+                    frequent_pairs.append((itemset, support))
+        return frequent_pairs
+    
+    def get_items(self):
+        """
+        Get all unique items in the current window
+        
+        Returns:
+        --------
+        set : all unique items
+        """
+        return set(self.item_counts)
+    
+    def find_frequent_itemsets(self):
+        """
+        Find frequent itemsets in the current window
+        
+        Returns:
+        --------
+        dict : {itemset_size: [(itemset, support), ...]}
+        """
+        self.frequent_itemsets = {}
+        if not self.transactions:
+            return self.frequent_itemsets
+        return super().find_frequent_itemsets()
+    
+    def generate_association_rules(self):
+        """
+        Generate association rules from the current window's frequent itemsets
+        
+        Returns:
+        --------
+        list : [(antecedent, consequent, support, confidence, lift), ...]
+        """
+        if not self.frequent_itemsets:
+            self.association_rules = []
+            return self.association_rules
+        return super().generate_association_rules()